@@ -0,0 +1,51 @@
+import gc
+import statistics
+import time
+import tracemalloc
+
+import httpx
+from nicegui import core, ui
+from nicegui.testing import User
+
+from nicedeck.deck import deck
+
+ADDITIONAL_CLIENTS = 3
+
+
+async def bench_render(synthetic_deck: dict, user: User, record: dict) -> None:
+    start = time.perf_counter()
+    client = await user.open('/')
+    build_time = time.perf_counter() - start
+    elements = len(client.elements)
+
+    carousel = next(iter(user.find(ui.carousel).elements))
+    latencies = []
+    slides = synthetic_deck['slides']
+    for i in [*range(1, slides), *reversed(range(slides - 1))]:
+        start = time.perf_counter()
+        carousel.set_value(str(i))
+        latencies.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(ADDITIONAL_CLIENTS):
+        await User(httpx.AsyncClient(transport=httpx.ASGITransport(core.app), base_url='http://test')).open('/')
+    gc.collect()
+    memory_per_client = (tracemalloc.get_traced_memory()[0] - before) / ADDITIONAL_CLIENTS
+    tracemalloc.stop()
+
+    latencies.sort()
+    record.update(synthetic_deck)
+    record.update({
+        'steps': sum(s.steps for s in deck.slides),
+        'build_time': build_time,
+        'elements': elements,
+        'memory_per_client': memory_per_client,
+        'navigation_latency': {
+            'mean': statistics.mean(latencies) if latencies else 0,
+            'p50': latencies[len(latencies) // 2] if latencies else 0,
+            'p95': latencies[int(len(latencies) * 0.95)] if latencies else 0,
+            'max': latencies[-1] if latencies else 0,
+        },
+    })
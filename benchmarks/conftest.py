@@ -0,0 +1,76 @@
+import json
+import os
+import platform
+from datetime import datetime, timezone
+from importlib.metadata import version
+from pathlib import Path
+
+import pytest
+from nicegui import __version__ as nicegui_version
+
+from nicedeck.deck import deck
+
+RESULTS: list[dict] = []
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption('--slides', default='10,100,1000', help='comma-separated deck sizes (default: 10,100,1000)')
+    parser.addoption('--max-steps', type=int, default=4, help='maximum number of steps per slide (default: 4)')
+    parser.addoption('--demo-every', type=int, default=10, help='add a demo to every n-th slide, 0: none (default: 10)')
+    parser.addoption('--window', type=int, default=None, help='render window passed to `nd.run` (default: all slides)')
+    parser.addoption('--benchmark-output', type=Path, default=Path('benchmark.json'), help='file for the results')
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if 'slides' in metafunc.fixturenames:
+        metafunc.parametrize('slides', [int(n) for n in metafunc.config.getoption('slides').split(',')])
+
+
+@pytest.fixture
+def synthetic_deck(slides: int, request: pytest.FixtureRequest) -> dict:
+    """Configure the synthetic deck before the `user` fixture runs it and return its configuration."""
+    config = {
+        'slides': slides,
+        'max_steps': request.config.getoption('max_steps'),
+        'demo_every': request.config.getoption('demo_every'),
+        'window': request.config.getoption('window'),
+    }
+    os.environ.update({f'NICEDECK_BENCHMARK_{key.upper()}': str(value)
+                       for key, value in config.items() if value is not None})
+    if config['window'] is None:
+        os.environ.pop('NICEDECK_BENCHMARK_WINDOW', None)
+    deck.slides.clear()
+    deck.slide_index = deck.slide_step = 0
+    yield config
+    deck.slides.clear()
+
+
+@pytest.fixture
+def record() -> dict:
+    """Collect a benchmark result which is written to the output file at the end of the session."""
+    result: dict = {}
+    RESULTS.append(result)
+    return result
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    if not RESULTS:
+        return
+    path: Path = session.config.getoption('benchmark_output')
+    path.write_text(json.dumps({
+        'nicedeck': version('nicedeck'),
+        'nicegui': nicegui_version,
+        'python': platform.python_version(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'results': RESULTS,
+    }, indent=2))
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    for result in RESULTS:
+        terminalreporter.write_line(
+            f'{result["slides"]:5d} slides: {result["build_time"] * 1000:8.1f} ms build, '
+            f'{result["elements"]:6d} elements, {result["memory_per_client"] / 1024:8.1f} KiB/client, '
+            f'{result["navigation_latency"]["p95"] * 1000:6.2f} ms p95 navigation')
+    if RESULTS:
+        terminalreporter.write_line(f'Results written to {config.getoption("benchmark_output")}')
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Measure how navigation fans out to a growing audience.
+
+A synthetic deck is started as a local server and N simulated followers connect to it via websockets.
+The deck is then moved through its slides while recording how long it takes until each follower receives the new slide,
+together with the CPU usage and the peak memory of the server.
+
+    python benchmarks/load_test.py --clients 10,100,400 --output load.json
+"""
+import argparse
+import ast
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from importlib.metadata import version
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+import socketio
+from nicegui import __version__ as nicegui_version
+
+MAIN_FILE = Path(__file__).parent / 'synthetic_deck.py'
+QUERY_PATTERN = re.compile(r'query: (\{.*?\}),\n')
+
+
+class Follower:
+    """A simulated audience member which connects to the follow page like a browser would."""
+
+    def __init__(self) -> None:
+        self.socket = socketio.AsyncClient(reconnection=False)
+        self.socket.on('update', self.handle_update)
+        self.target = ''
+        self.received = asyncio.Event()
+        self.received_at = 0.0
+
+    async def connect(self, http: httpx.AsyncClient) -> None:
+        response = await http.get('/follow')
+        response.raise_for_status()
+        query = ast.literal_eval(QUERY_PATTERN.search(response.text).group(1))
+        query = {key: str(value).lower() if isinstance(value, bool) else value for key, value in query.items()}
+        query.update(document_id=str(uuid.uuid4()), tab_id=str(uuid.uuid4()))
+        await self.socket.connect(f'{http.base_url}?{urlencode(query)}',
+                                  socketio_path='/_nicegui_ws/socket.io', transports=['websocket'])
+
+    def expect(self, slide_index: int) -> None:
+        self.target = f'Slide {slide_index}'
+        self.received.clear()
+
+    def handle_update(self, message: dict) -> None:
+        if any(isinstance(element, dict) and element.get('text') == self.target for element in message.values()):
+            self.received_at = time.perf_counter()
+            self.received.set()
+
+
+async def measure(http: httpx.AsyncClient, clients: int, *, slides: int, navigations: int, interval: float) -> dict:
+    """Connect the given number of followers, navigate through the deck and measure the fan-out."""
+    await http.post('/_benchmark/navigate/0/0')
+    followers = [Follower() for _ in range(clients)]
+    await asyncio.gather(*(follower.connect(http) for follower in followers))
+    await asyncio.sleep(interval)
+
+    latencies: list[float] = []
+    missed = 0
+    cpu_before = (await http.get('/_benchmark/stats')).json()['cpu_time']
+    start = time.perf_counter()
+    for n in range(1, navigations + 1):
+        slide_index = n % slides
+        for follower in followers:
+            follower.expect(slide_index)
+        sent_at = time.perf_counter()
+        await http.post(f'/_benchmark/navigate/{slide_index}/0')
+        _, pending = await asyncio.wait([asyncio.create_task(f.received.wait()) for f in followers], timeout=5)
+        for task in pending:
+            task.cancel()
+        missed += len(pending)
+        latencies.extend(f.received_at - sent_at for f in followers if f.received.is_set())
+        await asyncio.sleep(interval)
+    stats = (await http.get('/_benchmark/stats')).json()
+    cpu_usage = (stats['cpu_time'] - cpu_before) / (time.perf_counter() - start)
+
+    await asyncio.gather(*(follower.socket.disconnect() for follower in followers))
+    latencies.sort()
+    return {
+        'clients': clients,
+        'navigations': navigations,
+        'missed': missed,
+        'latency': {
+            'mean': statistics.mean(latencies) if latencies else None,
+            'p50': latencies[len(latencies) // 2] if latencies else None,
+            'p95': latencies[int(len(latencies) * 0.95)] if latencies else None,
+            'p99': latencies[int(len(latencies) * 0.99)] if latencies else None,
+            'max': latencies[-1] if latencies else None,
+        },
+        'cpu_usage': cpu_usage,
+        'max_rss': stats['max_rss'],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure how navigation fans out to a growing audience')
+    parser.add_argument('--clients', default='10,50,100,200,400', help='comma-separated numbers of followers')
+    parser.add_argument('--slides', type=int, default=10, help='number of slides of the synthetic deck')
+    parser.add_argument('--navigations', type=int, default=20, help='number of navigations per measurement')
+    parser.add_argument('--interval', type=float, default=0.5, help='pause between navigations (in seconds)')
+    parser.add_argument('--port', type=int, default=8765, help='port of the local server')
+    parser.add_argument('-o', '--output', type=Path, default=Path('load.json'), help='file for the results')
+    args = parser.parse_args()
+
+    env = {**os.environ, 'NICEDECK_BENCHMARK_SLIDES': str(args.slides), 'NICEDECK_BENCHMARK_PORT': str(args.port)}
+    storage = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+    server = subprocess.Popen([sys.executable, str(MAIN_FILE)], env=env, cwd=storage.name,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    results = []
+    try:
+        async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{args.port}', timeout=60) as http:
+            for _ in range(100):
+                try:
+                    await http.get('/_benchmark/stats')
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            for clients in [int(n) for n in args.clients.split(',')]:
+                result = await measure(http, clients,
+                                       slides=args.slides, navigations=args.navigations, interval=args.interval)
+                latency = result['latency']
+                print(f'{clients:5d} clients: '
+                      f'p50 {latency["p50"] * 1000:7.1f} ms, p95 {latency["p95"] * 1000:7.1f} ms, '
+                      f'p99 {latency["p99"] * 1000:7.1f} ms, missed {result["missed"]:4d}, '
+                      f'CPU {result["cpu_usage"] * 100:5.1f} %, peak RSS {result["max_rss"] / 1024**2:7.1f} MiB')
+                results.append(result)
+    finally:
+        server.terminate()
+        server.wait()
+        storage.cleanup()
+
+    args.output.write_text(json.dumps({
+        'nicedeck': version('nicedeck'),
+        'nicegui': nicegui_version,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'slides': args.slides,
+        'results': results,
+    }, indent=2))
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Synthetic deck for benchmarks, configured via environment variables set by the benchmarks."""
+import os
+import resource
+import sys
+import time
+
+from nicegui import app, ui
+
+import nicedeck as nd
+from nicedeck.deck import deck
+
+SLIDES = int(os.environ.get('NICEDECK_BENCHMARK_SLIDES', '10'))
+MAX_STEPS = int(os.environ.get('NICEDECK_BENCHMARK_MAX_STEPS', '4'))
+DEMO_EVERY = int(os.environ.get('NICEDECK_BENCHMARK_DEMO_EVERY', '10'))
+WINDOW = int(os.environ['NICEDECK_BENCHMARK_WINDOW']) if 'NICEDECK_BENCHMARK_WINDOW' in os.environ else None
+
+for i in range(SLIDES):
+    @nd.slide(f'Notes for slide *{i}*')
+    def _(i=i):
+        nd.heading(f'Slide {i}')
+        with ui.column().classes('absolute-center text-xl'):
+            for k in range(i % (MAX_STEPS + 1)):
+                with nd.step():
+                    ui.markdown(f'- Point {k + 1} of slide {i}')
+            if DEMO_EVERY and i % DEMO_EVERY == DEMO_EVERY - 1:
+                @nd.demo
+                def demo():
+                    ui.button(f'Click me {i}!', on_click=lambda: ui.notify('Clicked!'))
+
+
+@app.post('/_benchmark/navigate/{index}/{step}')
+def navigate(index: int, step: int) -> None:
+    """Move all presenters to the given position like a remote control would."""
+    deck.slide_index = index
+    deck.slide_step = step
+    deck.navigate.emit()
+
+
+@app.get('/_benchmark/stats')
+def stats() -> dict:
+    """Report the CPU time (in seconds) and the peak memory (in bytes) of the server process."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {'cpu_time': time.process_time(), 'max_rss': max_rss if sys.platform == 'darwin' else max_rss * 1024}
+
+
+nd.run(window=WINDOW, port=int(os.environ.get('NICEDECK_BENCHMARK_PORT', '8080')), show=False, reload=False)
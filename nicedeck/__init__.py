@@ -1,6 +1,8 @@
+from .assets import asset
 from .code import Code as code
 from .code import CodeResult as code_result
 from .code import Demo as demo
+from .code import highlight, highlight_css
 from .content import CenterColumn as center_column
 from .content import CenterHeading as center_heading
 from .content import CenterRow as center_row
@@ -8,8 +10,13 @@ from .content import Heading as heading
 from .step import Step as step
 from .run import run
 from .slide import slide
+from .state import MemoryBackend, SocketBackend, StateBackend
 
 __all__ = [
+    'MemoryBackend',
+    'SocketBackend',
+    'StateBackend',
+    'asset',
     'center_column',
     'center_heading',
     'center_row',
@@ -17,6 +24,8 @@ __all__ = [
     'code_result',
     'demo',
     'heading',
+    'highlight',
+    'highlight_css',
     'run',
     'slide',
     'step',
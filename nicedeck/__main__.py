@@ -0,0 +1,21 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from .export import export
+from .profile import profile
+
+parser = argparse.ArgumentParser(prog='python -m nicedeck', description='NiceDeck command line tools')
+subparsers = parser.add_subparsers(dest='command', required=True)
+export_parser = subparsers.add_parser('export', help='export a talk as a static website')
+export_parser.add_argument('main_file', type=Path, help='Python file defining and running the talk')
+export_parser.add_argument('-o', '--output', type=Path, default=Path('export'), help='output directory')
+profile_parser = subparsers.add_parser('profile', help='report the slides which take longest to render')
+profile_parser.add_argument('main_file', type=Path, help='Python file defining and running the talk')
+profile_parser.add_argument('-n', '--top', type=int, default=None, help='number of slides to report (default: all)')
+args = parser.parse_args()
+
+if args.command == 'export':
+    asyncio.run(export(args.main_file.resolve(), args.output.resolve()))
+if args.command == 'profile':
+    asyncio.run(profile(args.main_file.resolve(), args.top))
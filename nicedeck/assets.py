@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import ClassVar
+
+from fastapi import HTTPException
+from fastapi.responses import FileResponse
+from nicegui import background_tasks, run, ui
+from nicegui.logging import log
+
+ASSETS_URL = '/_nicedeck/assets'
+RASTER_SUFFIXES = {'.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tif', '.tiff'}
+
+
+@dataclass
+class Variant:
+    """A downscaled and converted version of a local image."""
+    source: Path
+    width: int
+    format: str
+
+
+class Assets:
+    """Registry of image variants which are converted once, cached on disk and served with content-hashed URLs."""
+    directory: Path = Path('.nicedeck') / 'assets'
+    width: int | None = None
+    format: str = 'webp'
+    variants: ClassVar[dict[str, Variant]] = {}
+    conversions: ClassVar[dict[str, asyncio.Task[bool]]] = {}
+
+    @classmethod
+    def url(cls,
+            path: str | Path, *,
+            width: int = 1920,
+            format: str = 'webp',  # pylint: disable=redefined-builtin
+            ) -> str:
+        """Register a downscaled variant of a local image and return its URL."""
+        source = Path(path).resolve()
+        stat = source.stat()
+        name = f'{_content_hash(source, stat.st_mtime_ns, stat.st_size)}-{width}.{format}'
+        if name not in cls.variants:
+            cls.variants[name] = Variant(source, width, format)
+            cls.conversions[name] = background_tasks.create(cls._convert(name), name=f'convert {source.name}')
+        return f'{ASSETS_URL}/{name}'
+
+    @classmethod
+    def optimize_images(cls,
+                        element: ui.element, *,
+                        width: int,
+                        format: str = 'webp',  # pylint: disable=redefined-builtin
+                        ) -> None:
+        """Replace the sources of local raster images within the element with URLs of downscaled variants."""
+        for image in element.descendants():
+            if isinstance(image, (ui.image, ui.interactive_image)) and isinstance(image.source, str):
+                source = _find_local_file(image.source)
+                if source is not None and source.suffix.lower() in RASTER_SUFFIXES:
+                    image.set_source(cls.url(source, width=width, format=format))
+
+    @classmethod
+    def collect(cls, element: ui.element) -> list[str]:
+        """Optimize the local images within the element if enabled and return the URLs the browser loads for them."""
+        if cls.width:
+            cls.optimize_images(element, width=cls.width, format=cls.format)
+        return [
+            image.props['src'] for image in element.descendants()
+            if isinstance(image, (ui.image, ui.interactive_image))
+            and isinstance(image.props.get('src'), str) and image.props['src']
+            and not image.props['src'].startswith('data:')
+        ]
+
+    @classmethod
+    async def serve(cls, name: str) -> FileResponse:
+        """Serve a variant, waiting for its conversion if necessary, or the original file if the conversion failed."""
+        if name not in cls.variants:
+            raise HTTPException(404, f'Unknown asset {name}')
+        if not await cls.conversions[name]:
+            return FileResponse(cls.variants[name].source)
+        return FileResponse(cls.directory / name, headers={'Cache-Control': 'public, max-age=31536000, immutable'})
+
+    @classmethod
+    async def _convert(cls, name: str) -> bool:
+        target = cls.directory / name
+        if not target.exists():
+            try:
+                await run.io_bound(_convert, cls.variants[name], target)
+            except Exception:
+                log.exception(f'Could not convert {cls.variants[name].source}, serving the original file instead')
+                return False
+        return True
+
+
+@lru_cache(maxsize=None)
+def _content_hash(path: Path, mtime_ns: int, size: int) -> str:  # pylint: disable=unused-argument
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def _find_local_file(source: str) -> Path | None:
+    if source.startswith(('http:', 'https:', 'data:', '//', '/_nicegui/')):
+        return None
+    for directory in [Path.cwd(), Path(sys.argv[0]).parent]:
+        path = directory / source.lstrip('/')
+        if path.is_file():
+            return path
+    return None
+
+
+def require_pillow() -> None:
+    """Raise an ImportError with an installation hint if Pillow is not available."""
+    try:
+        import PIL  # pylint: disable=import-outside-toplevel,unused-import  # noqa: F401
+    except ImportError as e:
+        raise ImportError('Optimizing images requires Pillow, e.g. via "pip install nicedeck[images]"') from e
+
+
+def _convert(variant: Variant, target: Path) -> None:
+    require_pillow()
+    from PIL import Image  # pylint: disable=import-outside-toplevel
+    with Image.open(variant.source) as image:
+        if image.mode not in {'RGB', 'RGBA'}:
+            image = image.convert('RGBA')
+        image.thumbnail((variant.width, image.height))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + '.tmp')
+        image.save(tmp, format=variant.format.upper())
+        tmp.replace(target)
+
+
+def asset(path: str | Path, *, width: int = 1920, format: str = 'webp') -> str:  # pylint: disable=redefined-builtin
+    """Get the content-hashed URL of a downscaled variant of a local image."""
+    return Assets.url(path, width=width, format=format)
@@ -0,0 +1,39 @@
+import hashlib
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+
+class Cache:
+    """A content-hash-keyed string cache kept in memory and optionally persisted to a JSON file."""
+    directory: Path | None = None
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.entries: dict[str, str] = {}
+        self.loaded_from: Path | None = None
+
+    @property
+    def path(self) -> Path | None:
+        return self.directory / f'{self.name}.json' if self.directory else None
+
+    def get(self, key: str, compute: Callable[[], str]) -> str:
+        """Return the cached value for the key or compute and store it."""
+        path = self.path
+        if path != self.loaded_from:
+            self._load(path)
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        if digest not in self.entries:
+            self.entries[digest] = compute()
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(self.entries))
+        return self.entries[digest]
+
+    def _load(self, path: Path | None) -> None:
+        self.loaded_from = path
+        if path is not None and path.is_file():
+            try:
+                self.entries.update(json.loads(path.read_text()))
+            except json.JSONDecodeError:
+                pass
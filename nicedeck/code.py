@@ -1,17 +1,49 @@
 import inspect
+import linecache
+from functools import lru_cache
 from typing import Callable
 
 import isort
+import pygments
 from nicegui import ui
+from nicegui.helpers import remove_indentation
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import TextLexer, get_lexer_by_name
+from pygments.style import Style
+from pygments.util import ClassNotFound
 
+from .cache import Cache
 
-class Code(ui.code):
+demo_cache = Cache('demo')
+DEMO_FORMAT_VERSION = 1  # increase when changing `_format_demo` to invalidate persisted entries
+_demo_sources: dict[tuple[str, int], tuple[list[str], str]] = {}
+
+
+class Code(ui.element):
     """A code block."""
 
     def __init__(self, code: str, *, language: str | None = 'python') -> None:
-        super().__init__(code, language=language)
-        self.classes('p-2 shadow-md')
-        self.copy_button.set_visibility(False)
+        super().__init__()
+        self.classes('nicegui-code p-2 shadow-md')
+        with self:
+            ui.html(highlight(remove_indentation(code), language), sanitize=False) \
+                .classes('nicegui-markdown overflow-auto h-full')
+
+
+@lru_cache(maxsize=None)
+def highlight(code: str, language: str | None = 'python') -> str:
+    """Highlight code with Pygments and return the HTML (styled by the CSS from `highlight_css`)."""
+    try:
+        lexer = get_lexer_by_name(language) if language else TextLexer()
+    except ClassNotFound:
+        lexer = TextLexer()
+    return pygments.highlight(code, lexer, HtmlFormatter(cssclass='codehilite', wrapcode=True))
+
+
+@lru_cache(maxsize=None)
+def highlight_css(style: str | type[Style] = 'default', selector: str = '.codehilite') -> str:
+    """Generate the CSS for a Pygments style once per process."""
+    return HtmlFormatter(nobackground=True, style=style).get_style_defs(selector)
 
 
 class CodeResult(ui.card):
@@ -40,7 +72,26 @@ class CodeResult(ui.card):
 
 
 def Demo(func: Callable) -> None:
-    source = inspect.getsource(func)
+    Code(demo_code(_demo_source(func)))
+    CodeResult(func)
+
+
+def _demo_source(func: Callable) -> str:
+    """Get the source of a function, reading it again only if `linecache` has reloaded its file."""
+    key = (func.__code__.co_filename, func.__code__.co_firstlineno)
+    lines = linecache.getlines(key[0])
+    if key not in _demo_sources or _demo_sources[key][0] is not lines:
+        _demo_sources[key] = (lines, inspect.getsource(func))
+    return _demo_sources[key][1]
+
+
+@lru_cache(maxsize=None)
+def demo_code(source: str) -> str:
+    """Format the source of a demo function once per process (and once per cache directory)."""
+    return demo_cache.get(f'{DEMO_FORMAT_VERSION}\n{isort.__version__}\n{source}', lambda: _format_demo(source))
+
+
+def _format_demo(source: str) -> str:
     lines = source.splitlines()
     lines = lines[2:]  # remove first two lines (@demo and def)
     indentation = len(lines[0]) - len(lines[0].lstrip())
@@ -50,6 +101,4 @@ def Demo(func: Callable) -> None:
     if not lines[-1].startswith('ui.run'):
         lines.append('')
         lines.append('ui.run()')
-    code = isort.code('\n'.join(lines), no_sections=True, lines_after_imports=1)
-    Code(code)
-    CodeResult(func)
+    return isort.code('\n'.join(lines), no_sections=True, lines_after_imports=1)
@@ -0,0 +1,37 @@
+export default {
+  template: `<span>{{ text }}</span>`,
+  props: {
+    remaining: Number,
+    running: Boolean,
+  },
+  data() {
+    return { text: "", deadline: 0 };
+  },
+  mounted() {
+    this.restart();
+    this.interval = setInterval(this.tick, 200);
+  },
+  unmounted() {
+    clearInterval(this.interval);
+  },
+  watch: {
+    remaining() {
+      this.restart();
+    },
+    running() {
+      this.restart();
+    },
+  },
+  methods: {
+    restart() {
+      this.deadline = performance.now() + this.remaining * 1000;
+      this.tick();
+    },
+    tick() {
+      const seconds = this.running ? (this.deadline - performance.now()) / 1000 : this.remaining;
+      const sign = seconds < 0 ? "-" : "";
+      const total = Math.abs(Math.trunc(seconds));
+      this.text = `${sign}${Math.floor(total / 60)}:${String(total % 60).padStart(2, "0")}`;
+    },
+  },
+};
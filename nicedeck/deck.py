@@ -1,37 +1,144 @@
 from __future__ import annotations
 
+import time
+import tracemalloc
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import ClassVar
 
-from nicegui import Event, app, binding
+from nicegui import Client, Event, app, ui
+from nicegui.elements.markdown import prepare_content
+from nicegui.logging import log
+from nicegui.page import page
+
+from .assets import Assets
+from .state import MemoryBackend, StateBackend
 
 
 @dataclass
 class Deck:
-    """Data object holding all slides, current index, and navigate event."""
+    """Data object holding all slides, current position, navigation events and the state backend."""
     slides: list[Slide] = field(default_factory=list)
+    names: dict[str, int] = field(default_factory=dict)
     slide_index: int = app.storage.general.get('slide_index', 0)
     slide_step: int = app.storage.general.get('slide_step', 0)
     navigate: Event = field(default_factory=Event[[]])
+    step_change: Event = field(default_factory=Event[[]])
+    slide_update: Event = field(default_factory=Event[[int]])
+    backend: StateBackend = field(default_factory=MemoryBackend)
+    shared_position: tuple[int, int] | None = None
 
     @property
     def current_slide(self) -> Slide:
         return self.slides[self.slide_index]
 
-    def __post_init__(self) -> None:
-        binding.bind_to(self, 'slide_index', app.storage.general, 'slide_index')
-        binding.bind_to(self, 'slide_step', app.storage.general, 'slide_step')
+    def add(self, s: Slide) -> None:
+        """Append a slide and index it by name."""
+        if s.name:
+            self.names[s.name] = len(self.slides)
+        self.slides.append(s)
+
+    def find(self, key: str) -> Slide | None:
+        """Look up a slide by name or index."""
+        if key in self.names:
+            return self.slides[self.names[key]]
+        if key.isdigit() and int(key) < len(self.slides):
+            return self.slides[int(key)]
+        return None
+
+    def persist(self) -> None:
+        """Write the current position to the general storage if it differs from the stored one."""
+        storage = app.storage.general
+        if storage.get('slide_index') != self.slide_index or storage.get('slide_step') != self.slide_step:
+            storage.update(slide_index=self.slide_index, slide_step=self.slide_step)
+
+    def publish(self) -> None:
+        """Send the current position to other server processes if it differs from the shared one."""
+        position = (self.slide_index, self.slide_step)
+        if position != self.shared_position:
+            self.shared_position = position
+            self.backend.publish(*position)
+
+    def receive(self, slide_index: int, slide_step: int) -> None:
+        """Move to a position published by another server process, clamped to the slides of this process."""
+        self.slide_index = min(max(slide_index, 0), len(self.slides) - 1)
+        self.slide_step = min(max(slide_step, 0), self.current_slide.steps - 1)
+        self.shared_position = (self.slide_index, self.slide_step)
+        self.navigate.emit()
+        self.step_change.emit()
+
+    def discover_steps(self, slides: list[Slide] | None = None) -> None:
+        """Determine the steps (unless declared) and assets of (all) slides by rendering them into a hidden client."""
+        client = Client(page(''))
+        with client:
+            for s in self.slides if slides is None else slides:
+                s.steps = s.declared_steps or s.steps
+                try:
+                    with ui.element() as container:
+                        s.render()
+                    s.assets = Assets.collect(container)
+                except Exception:
+                    log.exception(f'Could not discover the steps of slide {s.func.__name__}')
+        client.delete()
+
+
+@dataclass
+class RenderStats:
+    """Measurements of the renders of a slide; elements and allocated memory are only recorded while profiling."""
+    count: int = 0
+    total_time: float = 0.0
+    last_time: float = 0.0
+    elements: int = 0
+    allocated: int = 0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
 
 
 @dataclass
 class Slide:
     """Data object representing a slide in a deck."""
     rendering: ClassVar[Slide | None] = None
+    profiling: ClassVar[bool] = False
 
     func: Callable[[], None]
     notes: str = ''
+    declared_steps: int | None = None
+    name: str | None = None
+    notes_html: str = field(init=False)
     steps: int = field(default=1, init=False)
+    step_counter: int = field(default=1, init=False)
+    step_elements: list[ui.element] = field(default_factory=list, init=False)
+    assets: list[str] = field(default_factory=list, init=False)
+    stats: RenderStats = field(default_factory=RenderStats, init=False)
+
+    def __post_init__(self) -> None:
+        self.notes_html = prepare_content(self.notes, extras='fenced-code-blocks tables')
+
+    def render(self) -> list[ui.element]:
+        """Call the slide function, count its steps and return the step elements it created."""
+        Slide.rendering = self
+        self.step_counter = 1
+        self.step_elements = []
+        if Slide.profiling:
+            elements = len(ui.context.client.elements)
+            tracemalloc.reset_peak()
+            memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            self.func()
+        finally:
+            Slide.rendering = None
+            self.stats.count += 1
+            self.stats.last_time = time.perf_counter() - start
+            self.stats.total_time += self.stats.last_time
+            if Slide.profiling:
+                self.stats.elements = len(ui.context.client.elements) - elements
+                self.stats.allocated = max(self.stats.allocated, tracemalloc.get_traced_memory()[1] - memory)
+        self.steps = self.declared_steps or self.step_counter
+        step_elements, self.step_elements = self.step_elements, []
+        return step_elements
 
 
 deck = Deck()
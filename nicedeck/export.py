@@ -0,0 +1,130 @@
+import json
+import os
+import re
+import runpy
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+from nicegui import __version__, core, ui
+
+EXPORT_CSS = '''
+    .nicegui-content { padding: 0 }
+    .overview-slide { display: none !important; position: fixed; inset: 0; max-width: none }
+    .overview-slide.nicedeck-current { display: flex !important }
+    .overview-slide > .q-card { height: 100%; aspect-ratio: auto; border: none; border-radius: 0 }
+    #popup { display: none !important }
+'''
+
+EXPORT_JS = '''
+    let index = 0;
+    let step = 0;
+    const slides = () => [...document.querySelectorAll(".overview-slide")];
+    function show() {
+        slides().forEach((slide, i) => slide.classList.toggle("nicedeck-current", i === index));
+        if (slides()[index]) slides()[index].dataset.step = step;
+    }
+    document.addEventListener("keydown", (event) => {
+        const steps = Number(slides()[index].dataset.steps);
+        if (event.key === "ArrowLeft") {
+            if (step > 0) step -= 1;
+            else if (index > 0) step = Number(slides()[--index].dataset.steps) - 1;
+        }
+        if (event.key === "ArrowRight") {
+            if (step < steps - 1) step += 1;
+            else if (index < slides().length - 1) [index, step] = [index + 1, 0];
+        }
+        show();
+    });
+    const waitForSlides = setInterval(() => {
+        if (slides().length) {
+            clearInterval(waitForSlides);
+            show();
+        }
+    }, 50);
+'''
+
+SOCKET_STUB = '''
+    window.io = () => ({ io: { on() {}, engine: {}, opts: {} }, on() {}, emit() {} });
+'''
+
+FILE_PATTERN = re.compile(r'"([^"\s<>]+\.(?:png|jpe?g|webp|avif|gif|svg|ico|mp4|webm|pdf|css|m?js|woff2?|ttf|eot))"')
+JS_IMPORT_PATTERN = re.compile(r'''(?:\bfrom|\bimport)\s*\(?\s*["']([^"']+)["']''')
+CSS_URL_PATTERN = re.compile(r'''url\(\s*["']?([^"')]+)["']?\s*\)''')
+IMPORT_MAP_PATTERN = re.compile(r'<script type="importmap">(.*?)</script>', re.DOTALL)
+
+
+def add_export_navigation() -> None:
+    """Add styles and a script for presenting the overview page without a server."""
+    ui.add_css(EXPORT_CSS)
+    ui.add_body_html(f'<script>{EXPORT_JS}</script>')
+
+
+@asynccontextmanager
+async def simulate(main_file: Path) -> AsyncIterator[httpx.AsyncClient]:
+    """Run the talk in `main_file` without a server and yield an HTTP client for requesting its pages."""
+    os.environ['NICEGUI_USER_SIMULATION'] = 'true'
+    sys.path.insert(0, str(main_file.parent))
+    runpy.run_path(str(main_file), run_name='__main__')
+    async with core.app.router.lifespan_context(core.app):
+        transport = httpx.ASGITransport(core.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://nicedeck') as client:
+            yield client
+
+
+async def export(main_file: Path, output: Path) -> None:
+    """Run the talk in `main_file` without a server and write its slides as a static site into `output`."""
+    async with simulate(main_file) as client:
+        response = await client.get('/overview?export=true', headers={'X-Forwarded-Prefix': '.'})
+        response.raise_for_status()
+        html = response.text
+        import_map = IMPORT_MAP_PATTERN.search(html)
+        imports: dict[str, str] = json.loads(import_map.group(1))['imports'] if import_map else {}
+        files: dict[str, bytes] = {}
+        pending = _find_references(IMPORT_MAP_PATTERN.sub('', html), '/overview', 'html', imports)
+        pending.update(f'/_nicegui/{__version__}/dynamic_resources/{name}'  # loaded by markdown.js
+                       for name in re.findall(r'"resource-name":"([^"]+)"', html))
+        while pending:
+            path = pending.pop()
+            if path in files:
+                continue
+            file_response = await client.get(path)
+            if file_response.status_code != 200 or 'text/html' in file_response.headers.get('content-type', ''):
+                continue
+            files[path] = file_response.content
+            suffix = Path(path).suffix
+            if suffix in {'.js', '.mjs', '.css'}:
+                pending.update(_find_references(file_response.text, path, suffix[1:], imports) - files.keys())
+
+    for path, content in files.items():
+        if path.endswith('/socket.io.min.js'):
+            content = SOCKET_STUB.encode()
+        target = output / path.lstrip('/')
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        html = html.replace(f'"{path}"', f'"./{path.lstrip("/")}"')
+    (output / 'index.html').write_text(html)
+    print(f'Exported {len(files)} files to {output / "index.html"}')
+
+
+def _find_references(content: str, base: str, kind: str, imports: dict[str, str]) -> set[str]:
+    """Find local files referenced by an HTML, JavaScript or CSS document and resolve them to absolute paths."""
+    pattern = {'html': FILE_PATTERN, 'js': JS_IMPORT_PATTERN, 'mjs': JS_IMPORT_PATTERN, 'css': CSS_URL_PATTERN}[kind]
+    paths = set()
+    for reference in pattern.findall(content):
+        if reference.startswith(('http:', 'https:', 'data:', '//')):
+            continue
+        if kind != 'html' and not reference.startswith(('/', './', '../')):
+            if reference in imports:
+                reference, base = imports[reference], '/overview'
+            elif prefix := next((key for key in imports if key.endswith('/') and reference.startswith(key)), None):
+                reference, base = imports[prefix] + reference.removeprefix(prefix), '/overview'
+            else:
+                continue
+        path = urlsplit(urljoin(base, reference)).path
+        if not path.endswith('/'):
+            paths.add(path)
+    return paths
@@ -0,0 +1,26 @@
+export default {
+  template: `<span style="display: none"></span>`,
+  mounted() {
+    this.pending = null;
+    this.listener = (event) => {
+      if (event.key !== "ArrowLeft" && event.key !== "ArrowRight") return;
+      const keydown = performance.now();
+      const painted = new Promise((resolve) => requestAnimationFrame(() => setTimeout(() => resolve(performance.now()))));
+      this.pending = { keydown, painted };
+    };
+    document.addEventListener("keydown", this.listener, true);
+  },
+  unmounted() {
+    document.removeEventListener("keydown", this.listener, true);
+  },
+  methods: {
+    async done(coalesce, handler, binding) {
+      if (this.pending === null) return;
+      const { keydown, painted } = this.pending;
+      this.pending = null;
+      const total = performance.now() - keydown;
+      const dom = (await painted) - keydown;
+      this.$emit("measure", { total, coalesce, handler, binding, dom });
+    },
+  },
+};
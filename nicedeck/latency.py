@@ -0,0 +1,84 @@
+import time
+from collections import deque
+
+from nicegui import events, ui
+
+COMPONENTS = ('total', 'network', 'coalesce', 'handler', 'binding', 'dom')
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LatencyHistogram:
+    """Rolling histogram of the most recent navigation latencies (in milliseconds) per component.
+
+    The total is the time from a key press to the acknowledgement by the server.
+    It is split into network, coalesce (waiting for further key presses), handler and binding.
+    The DOM time is measured independently from the key press to the paint of the local change in the browser.
+    """
+
+    def __init__(self, size: int = 200) -> None:
+        self.samples: dict[str, deque[float]] = {component: deque(maxlen=size) for component in COMPONENTS}
+
+    def add(self, *, total: float, coalesce: float, handler: float, binding: float, dom: float) -> None:
+        """Add a measurement; the network time is what remains of the total after the server time."""
+        network = max(total - coalesce - handler - binding, 0)
+        for component, value in zip(COMPONENTS, (total, network, coalesce, handler, binding, dom)):
+            self.samples[component].append(value)
+
+    def summary(self) -> dict[str, dict]:
+        """Return count, percentiles and bucket counts for each component."""
+        result = {}
+        for component, samples in self.samples.items():
+            values = sorted(samples)
+            result[component] = {
+                'count': len(values),
+                'p50': values[len(values) // 2] if values else None,
+                'p95': values[int(len(values) * 0.95)] if values else None,
+                'max': values[-1] if values else None,
+                'buckets': {
+                    **{f'le_{bucket}': sum(1 for value in values if value <= bucket) for bucket in BUCKETS},
+                    'le_inf': len(values),
+                },
+            }
+        return result
+
+
+class LatencyProbe(ui.element, component='latency.js'):
+    """Measures the time from a key press to its local paint and to its acknowledgement by the server."""
+
+    def __init__(self, histogram: LatencyHistogram) -> None:
+        super().__init__()
+        self.pressed: float | None = None
+        self.applied: float | None = None
+        self.handled: float | None = None
+        self.on('measure', lambda e: self._handle_measure(histogram, e))
+
+    def start(self) -> None:
+        """Mark the arrival of a key event on the server."""
+        self.pressed = time.perf_counter()
+        self.applied = self.handled = None
+
+    def apply(self) -> None:
+        """Mark the start of the key handler after coalescing the key events of a burst."""
+        self.applied = time.perf_counter()
+
+    def handle(self) -> None:
+        """Mark that the deck has been updated; the remaining time until `finish` is spent on updating the page."""
+        self.handled = time.perf_counter()
+
+    def finish(self) -> None:
+        """Mark the propagation of the change and let the browser complete the measurement."""
+        if self.pressed is None or self.applied is None or self.handled is None:
+            return
+        coalesce = (self.applied - self.pressed) * 1000
+        handler = (self.handled - self.applied) * 1000
+        binding = (time.perf_counter() - self.handled) * 1000
+        self.pressed = self.applied = self.handled = None
+        self.run_method('done', coalesce, handler, binding)
+
+    @staticmethod
+    def _handle_measure(histogram: LatencyHistogram, e: events.GenericEventArguments) -> None:
+        histogram.add(total=e.args['total'], coalesce=e.args['coalesce'], handler=e.args['handler'],
+                      binding=e.args['binding'], dom=e.args['dom'])
+
+
+latency = LatencyHistogram()
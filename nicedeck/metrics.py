@@ -0,0 +1,77 @@
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+from fastapi.responses import PlainTextResponse
+from nicegui import Client
+
+from .deck import deck
+from .latency import latency
+
+
+class Metrics:
+    """Counters of the running deck which are served in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.navigations = 0
+        self.position: tuple[int, int] | None = None
+
+    def count_navigation(self) -> None:
+        """Count a navigation event if the position has actually changed."""
+        position = (deck.slide_index, deck.slide_step)
+        if position != self.position:
+            self.position = position
+            self.navigations += 1
+
+    def serve(self) -> PlainTextResponse:
+        """Serve all metrics in the Prometheus text format."""
+        lines: list[str] = []
+
+        def add(name: str, kind: str, description: str, samples: dict[str, float]) -> None:
+            """Add a metric with samples mapping a name suffix and labels to a value."""
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(f'{name}{labels} {value}' for labels, value in samples.items())
+
+        clients = Counter(client.page.path for client in Client.instances.values() if client.has_socket_connection)
+        add('nicedeck_connected_clients', 'gauge', 'Number of connected clients per route.',
+            {f'{{route="{route}"}}': clients[route]
+             for route in sorted({'/', '/follow', '/notes', '/overview', *clients})})
+        add('nicedeck_slide_render_seconds', 'summary', 'Time spent rendering each slide.', {
+            **{f'_sum{{slide="{i}",func="{s.func.__name__}"}}': s.stats.total_time for i, s in enumerate(deck.slides)},
+            **{f'_count{{slide="{i}",func="{s.func.__name__}"}}': s.stats.count for i, s in enumerate(deck.slides)},
+        })
+        add('nicedeck_navigations_total', 'counter', 'Number of changes of the slide position.', {'': self.navigations})
+        add('nicedeck_slide_index', 'gauge', 'Index of the current slide.', {'': deck.slide_index})
+        add('nicedeck_navigate_subscribers', 'gauge', 'Number of subscribers of deck.navigate.',
+            {'': len(deck.navigate.callbacks)})
+        add('nicedeck_step_change_subscribers', 'gauge', 'Number of subscribers of deck.step_change.',
+            {'': len(deck.step_change.callbacks)})
+        memory = _memory()
+        if memory:
+            add('nicedeck_process_memory_bytes', 'gauge', 'Memory of the server process.',
+                {f'{{kind="{kind}"}}': value for kind, value in memory.items()})
+        for component, summary in latency.summary().items():
+            if summary['count']:
+                add(f'nicedeck_keypress_latency_{component}_milliseconds', 'gauge',
+                    f'Recent keypress latency ({component}).',
+                    {f'{{quantile="{q}"}}': summary[f'p{q * 100:.0f}'] for q in (0.5, 0.95)})
+        return PlainTextResponse('\n'.join(lines) + '\n', media_type='text/plain; version=0.0.4')
+
+
+def _memory() -> dict[str, int]:
+    memory = {}
+    statm = Path('/proc/self/statm')
+    if statm.exists():
+        memory['resident'] = int(statm.read_text().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:  # not available on Windows
+        return memory
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    memory['peak_resident'] = max_rss if sys.platform == 'darwin' else max_rss * 1024
+    return memory
+
+
+metrics = Metrics()
@@ -0,0 +1,69 @@
+export default {
+  template: `<span style="display: none"></span>`,
+  props: {
+    carousel: Number,
+    index: Number,
+    step: Number,
+    steps: Array,
+    seq: Number,
+  },
+  mounted() {
+    this.position = { index: this.index, step: this.step };
+    this.sent = this.seq;
+    this.listener = (event) => {
+      const focus = document.activeElement;
+      if (focus && ["input", "select", "button", "textarea"].includes(focus.tagName.toLowerCase())) return;
+      if (event.key === "ArrowLeft") this.move(-1);
+      if (event.key === "ArrowRight") this.move(1);
+    };
+    document.addEventListener("keydown", this.listener);
+  },
+  unmounted() {
+    document.removeEventListener("keydown", this.listener);
+  },
+  watch: {
+    index() {
+      this.reconcile();
+    },
+    step() {
+      this.reconcile();
+    },
+    seq() {
+      this.reconcile();
+    },
+  },
+  methods: {
+    move(direction) {
+      let { index, step } = this.position;
+      if (direction < 0) {
+        if (step > 0) step -= 1;
+        else if (index > 0) {
+          index -= 1;
+          step = this.steps[index] - 1;
+        }
+      } else {
+        if (step < this.steps[index] - 1) step += 1;
+        else if (index < this.steps.length - 1) {
+          index += 1;
+          step = 0;
+        }
+      }
+      if (index === this.position.index && step === this.position.step) return;
+      this.show(index, step);
+      this.sent += 1;
+      this.$emit("navigate", { index, step, seq: this.sent });
+    },
+    reconcile() {
+      if (this.seq < this.sent) return; // the server has not answered all navigations yet
+      if (this.index !== this.position.index || this.step !== this.position.step) this.show(this.index, this.step);
+    },
+    show(index, step) {
+      this.position = { index, step };
+      const carousel = mounted_app.elements[this.carousel];
+      if (!carousel) return;
+      carousel.props["model-value"] = String(index);
+      const slide = mounted_app.elements[carousel.children[index]];
+      if (slide) slide.props["data-step"] = step;
+    },
+  },
+};
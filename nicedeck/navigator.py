@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Callable
+
+from nicegui import events, ui
+
+from .deck import deck
+
+
+class Navigator(ui.element, component='navigator.js'):
+    """Navigates with the arrow keys in the browser and reconciles the position with the server.
+
+    The browser shows the new position immediately and sends it to the server afterwards.
+    The server clamps it to the deck and always answers with the authoritative position.
+    The browser adopts it as soon as all of its own navigations have been answered.
+    The first navigation of a burst is applied immediately.
+    Navigations following within `window` seconds are coalesced and only the last one is applied,
+    but at least every `max_wait` seconds while the burst lasts.
+    """
+
+    def __init__(self,
+                 carousel: ui.carousel,
+                 on_navigate: Callable[[int, int], None], *,
+                 on_arrive: Callable[[], None] | None = None,
+                 window: float = 0,
+                 max_wait: float = 0.5,
+                 ) -> None:
+        super().__init__()
+        self.on_navigate = on_navigate
+        self.on_arrive = on_arrive
+        self.window = window
+        self.max_wait = max_wait
+        self.pending: dict[str, Any] | None = None
+        self.timer: asyncio.TimerHandle | None = None
+        self.deadline = 0.0
+        self.props.update(carousel=carousel.id, seq=0)
+        self.update_position()
+        self.on('navigate', self._handle_navigate)
+        deck.navigate.subscribe(self.update_position)
+        deck.step_change.subscribe(self.update_position)
+        deck.slide_update.subscribe(lambda _: self.update_position())
+
+    def update_position(self) -> None:
+        """Send the position of the deck and the number of steps per slide to the browser."""
+        self.props.update(index=deck.slide_index, step=deck.slide_step, steps=[s.steps for s in deck.slides])
+
+    def _handle_navigate(self, e: events.GenericEventArguments) -> None:
+        if self.on_arrive:
+            self.on_arrive()
+        self.pending = e.args
+        if self.timer is None:
+            self._apply()
+            return
+        self.timer.cancel()
+        loop = asyncio.get_running_loop()
+        self.timer = loop.call_later(max(min(self.window, self.deadline - loop.time()), 0), self._apply)
+
+    def _apply(self) -> None:
+        self.timer = None
+        if self.pending is None or self.is_deleted:
+            return
+        if self.window:
+            loop = asyncio.get_running_loop()
+            self.deadline = loop.time() + self.max_wait
+            self.timer = loop.call_later(self.window, self._apply)
+        index, step, seq = self.pending['index'], self.pending['step'], self.pending['seq']
+        self.pending = None
+        index = min(max(index, 0), len(deck.slides) - 1)
+        step = min(max(step, 0), deck.slides[index].steps - 1)
+        self.on_navigate(index, step)
+        self.props['seq'] = seq
+        self.update_position()
+
+    def _handle_delete(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+        super()._handle_delete()
@@ -0,0 +1,41 @@
+import tracemalloc
+from pathlib import Path
+
+from .deck import Slide, deck
+from .export import simulate
+
+
+def enable_profiling() -> None:
+    """Record the wall time, created elements and allocated memory of every slide render."""
+    Slide.profiling = True
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def location(s: Slide) -> str:
+    """Return the file name and line number of the slide function."""
+    return f'{Path(s.func.__code__.co_filename).name}:{s.func.__code__.co_firstlineno}'
+
+
+def annotation(s: Slide) -> str:
+    """Summarize the last render of a slide in one line."""
+    return f'{s.stats.last_time * 1000:.1f} ms · {s.stats.elements} elements · {s.stats.allocated / 1024:.0f} KiB'
+
+
+def report(top: int | None = None) -> str:
+    """Format a table of the rendered slides, sorted by their mean render time."""
+    ranked = sorted((s for s in deck.slides if s.stats.count), key=lambda s: s.stats.mean_time, reverse=True)
+    lines = [f'{"slide":>5}  {"location":<24} {"mean ms":>9} {"renders":>8} {"elements":>9} {"KiB":>9}']
+    for s in ranked[:top]:
+        lines.append(f'{deck.slides.index(s):5d}  {location(s):<24} {s.stats.mean_time * 1000:9.1f} '
+                     f'{s.stats.count:8d} {s.stats.elements:9d} {s.stats.allocated / 1024:9.0f}')
+    return '\n'.join(lines)
+
+
+async def profile(main_file: Path, top: int | None) -> None:
+    """Run the talk in `main_file` without a server, render every slide and print the slowest ones."""
+    enable_profiling()
+    async with simulate(main_file) as client:
+        response = await client.get('/overview?print=true')
+        response.raise_for_status()
+    print(report(top))
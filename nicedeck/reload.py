@@ -0,0 +1,91 @@
+import hashlib
+import inspect
+import linecache
+import runpy
+from pathlib import Path
+from typing import ClassVar
+
+from nicegui import Client
+from nicegui.logging import log
+
+from .deck import Slide, deck
+
+
+class HotReloader:
+    """Re-executes the talk when its file changes and swaps only the slides whose source has changed.
+
+    If code outside of the slide functions has changed, all slides are replaced and open pages are reloaded.
+    """
+    reloading: ClassVar[bool] = False
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.mtime = path.stat().st_mtime_ns
+        self.hashes = [_source_hash(s) for s in deck.slides]
+        self.module_hash = _module_hash(path, deck.slides)
+
+    def check(self) -> None:
+        """Reload the talk if its file has been modified."""
+        mtime = self.path.stat().st_mtime_ns
+        if mtime == self.mtime:
+            return
+        self.mtime = mtime
+        try:
+            slides = self._load()
+        except Exception:
+            log.exception(f'Could not reload {self.path.name}')
+            return
+
+        hashes = [_source_hash(s) for s in slides]
+        module_hash = _module_hash(self.path, slides)
+        deck.names = {s.name: i for i, s in enumerate(slides) if s.name}
+        if len(slides) != len(deck.slides) or module_hash != self.module_hash:
+            deck.slides[:] = slides
+            self.hashes = hashes
+            self.module_hash = module_hash
+            deck.discover_steps()
+            deck.slide_index = min(deck.slide_index, len(slides) - 1)
+            deck.slide_step = min(deck.slide_step, deck.current_slide.steps - 1)
+            for client in Client.instances.values():
+                if client.has_socket_connection:
+                    client.run_javascript('location.reload()')
+            log.info(f'Reloaded all {len(slides)} slides of {self.path.name}')
+            return
+
+        changed = [i for i, (old, new) in enumerate(zip(self.hashes, hashes)) if old != new]
+        for i in changed:
+            deck.slides[i] = slides[i]
+        self.hashes = hashes
+        deck.discover_steps([deck.slides[i] for i in changed])
+        deck.slide_step = min(deck.slide_step, deck.current_slide.steps - 1)
+        for i in changed:
+            deck.slide_update.emit(i)
+        if changed:
+            log.info(f'Reloaded slides {", ".join(map(str, changed))} of {self.path.name}')
+
+    def _load(self) -> list[Slide]:
+        """Execute the talk again and return the slides it registers, without changing the deck."""
+        previous, deck.slides, deck.names = (deck.slides, deck.names), [], {}
+        HotReloader.reloading = True
+        try:
+            linecache.checkcache(str(self.path))
+            runpy.run_path(str(self.path), run_name='__main__')
+            return deck.slides
+        finally:
+            deck.slides, deck.names = previous
+            HotReloader.reloading = False
+
+
+def _module_hash(path: Path, slides: list[Slide]) -> str:
+    """Hash the code of the file outside of its slide functions, e.g. helpers, constants and `setup`."""
+    lines = list(linecache.getlines(str(path)))
+    for s in slides:
+        if Path(s.func.__code__.co_filename).resolve() == path.resolve():
+            source, start = inspect.getsourcelines(s.func)
+            lines[start - 1:start - 1 + len(source)] = [''] * len(source)
+    return hashlib.sha256(''.join(lines).encode()).hexdigest()
+
+
+def _source_hash(s: Slide) -> str:
+    source = f'{inspect.getsource(s.func)}\n{s.notes}\n{s.declared_steps}\n{s.name}'
+    return hashlib.sha256(source.encode()).hexdigest()
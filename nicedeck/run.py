@@ -1,93 +1,339 @@
-from typing import Callable
+import json
+import sys
+from pathlib import Path
+from typing import Callable, cast
 
+from .assets import ASSETS_URL, Assets, require_pillow
+from .cache import Cache
+from .code import highlight_css
 from .deck import Slide, deck
-from .timer import Timer
-from nicegui import events, ui
+from .export import add_export_navigation
+from .latency import LatencyProbe, latency
+from .metrics import metrics as deck_metrics
+from .navigator import Navigator
+from .profile import annotation, enable_profiling
+from .reload import HotReloader
+from .state import StateBackend
+from .step import Step, StepStyle
+from .timer import Countdown, Timer
+from fastapi import HTTPException
+from nicegui import app, events, ui
 
-NOTE_CLASSES = 'text-gray-400 [&_em]:text-black [&_em]:not-italic [&_em]:font-medium [&_code]:text-[90%]'
+NOTE_CLASSES = 'nicegui-markdown text-gray-400 ' \
+    '[&_em]:text-black [&_em]:not-italic [&_em]:font-medium [&_code]:text-[90%]'
 
 
-def run(*, time_limit: float = 0, setup: Callable | None = None, classes: str = '', props: str = '', **kwargs) -> None:
+def run(*,
+        time_limit: float = 0,
+        setup: Callable | None = None,
+        classes: str = '',
+        props: str = '',
+        window: int | None = None,
+        evict: int | None = None,
+        cache_dir: str | Path | None = None,
+        persist_interval: float = 1.0,
+        image_width: int | None = None,
+        image_format: str = 'webp',
+        prefetch: int = 2,
+        coalesce_window: float = 0.1,
+        coalesce_max_wait: float = 0.5,
+        state_backend: StateBackend | None = None,
+        measure_latency: bool = False,
+        metrics: bool = False,
+        profile: bool = False,
+        hot_reload: bool = False,
+        **kwargs) -> None:
+    """Run the slideshow.
+
+    :param time_limit: time limit for the countdown timer on the notes page (in seconds)
+    :param setup: optional function to be called at the beginning of each page
+    :param classes: Tailwind classes for the carousel
+    :param props: Quasar props for the carousel
+    :param window: number of neighboring slides to render around the current one (default: all slides)
+    :param evict: distance from the current slide beyond which rendered slides are removed again (default: never)
+    :param cache_dir: directory for persisting formatted code snippets across restarts (default: memory only)
+    :param persist_interval: interval for writing the current position to the general storage (in seconds)
+    :param image_width: if set, local images are served as variants downscaled to this width (requires Pillow)
+    :param image_format: image format of the downscaled variants, e.g. "webp" or "avif"
+    :param prefetch: number of upcoming slides whose images are preloaded by the browser
+    :param coalesce_window: time window for merging rapid key presses into one navigation on the server (in seconds)
+    :param coalesce_max_wait: maximum delay of a navigation on the server while key presses are merged (in seconds)
+    :param state_backend: backend for sharing the position between server processes (default: in-memory)
+    :param measure_latency: measure key press latencies until local paint and server response at /_nicedeck/latency
+    :param metrics: serve metrics like connected clients and render times in the Prometheus format at /metrics
+    :param profile: record time, elements and memory of every slide render and show them on the overview page
+    :param hot_reload: instead of restarting the server on changes, swap changed slides into open pages (development)
+    :param kwargs: additional arguments for `ui.run`
+    """
+    if HotReloader.reloading:
+        return
+    if image_width:
+        require_pillow()
     timer = Timer(time_limit)
+    Cache.directory = Path(cache_dir) if cache_dir is not None else None
+    if cache_dir is not None:
+        Assets.directory = Path(cache_dir) / 'assets'
+    Assets.width = image_width
+    Assets.format = image_format
+    if image_width:
+        app.get(f'{ASSETS_URL}/{{name}}')(Assets.serve)
+    if state_backend is not None:
+        deck.backend = state_backend
+    if measure_latency:
+        app.get('/_nicedeck/latency')(latency.summary)
+    if profile:
+        enable_profiling()
+    if hot_reload:
+        kwargs['reload'] = False
+        app.timer(0.2, HotReloader(Path(sys.modules['__main__'].__file__)).check)
+    if metrics:
+        app.get('/metrics')(deck_metrics.serve)
+        deck.navigate.subscribe(deck_metrics.count_navigation)
+        deck.step_change.subscribe(deck_metrics.count_navigation)
+    app.on_startup(deck.discover_steps)
+    app.on_startup(lambda: deck.backend.start(deck.receive))
+    app.on_shutdown(deck.backend.stop)
+    deck.navigate.subscribe(deck.publish)
+    deck.step_change.subscribe(deck.publish)
+    app.timer(persist_interval, deck.persist)
+    app.on_shutdown(deck.persist)
+    ui.add_css(highlight_css() + highlight_css('github-dark', '.body--dark .codehilite'), shared=True)
+
+    def render(s: Slide, container: ui.element) -> None:
+        with container:
+            for step in cast(list[Step], s.render()):
+                step.limit(s.steps)
+        s.assets = Assets.collect(container)
 
     @ui.page('/')
     def index():
         if setup:
             setup()
 
+        step_style = StepStyle()
         carousel = ui.carousel().classes(classes).props(props).props('fullscreen navigation') \
             .bind_value_from(deck, 'slide_index', str)
 
-        @carousel.on_value_change
-        def _(e: events.ValueChangeEventArguments) -> None:
-            deck.slide_index = int(e.value)
+        probe = LatencyProbe(latency) if measure_latency else None
+
+        def select(e: events.GenericEventArguments) -> None:
+            deck.slide_index = int(e.args)
+            deck.slide_step = min(deck.slide_step, deck.current_slide.steps - 1)
             deck.navigate.emit()
 
-        @ui.keyboard
-        def _(e: events.KeyEventArguments) -> None:
-            if e.action.keydown and e.key.arrow_left:
-                if deck.slide_step > 0:
-                    deck.slide_step -= 1
-                elif deck.slide_index > 0:
-                    deck.slide_index -= 1
-                    deck.slide_step = deck.current_slide.steps - 1
-            if e.action.keydown and e.key.arrow_right:
-                if deck.slide_step < deck.current_slide.steps - 1:
-                    deck.slide_step += 1
-                elif deck.slide_index < len(deck.slides) - 1:
-                    deck.slide_index += 1
-                    deck.slide_step = 0
+        carousel.on('update:model-value', select)
+
+        def navigate(index: int, step: int) -> None:
+            if probe:
+                probe.apply()
+            previous_index, previous_step = deck.slide_index, deck.slide_step
+            deck.slide_index, deck.slide_step = index, step
+            if probe:
+                probe.handle()
+            carousel.value = str(index)
+            if deck.slide_index != previous_index:
+                deck.navigate.emit()
+            if deck.slide_step != previous_step:
+                deck.step_change.emit()
+            if probe:
+                probe.finish()
+
+        Navigator(carousel, navigate, on_arrive=probe.start if probe else None,
+                  window=coalesce_window, max_wait=coalesce_max_wait)
 
         with carousel:
-            for i, s in enumerate(deck.slides):
-                Slide.rendering = s
-                s.steps = 1
-                with ui.carousel_slide(name=str(i)).style('padding: 0'):
-                    s.func()
-            Slide.rendering = None
+            carousel_slides = [ui.carousel_slide(name=str(i)).style('padding: 0').props('data-step=0')
+                               for i in range(len(deck.slides))]
+        rendered: set[int] = set()
+
+        def update_window() -> None:
+            for i, carousel_slide in enumerate(carousel_slides):
+                distance = abs(i - int(carousel.value))
+                if i not in rendered and (window is None or distance <= window):
+                    render(deck.slides[i], carousel_slide)
+                    rendered.add(i)
+                elif i in rendered and evict is not None and distance > max(evict, window or 0):
+                    carousel_slide.clear()
+                    rendered.discard(i)
+
+        carousel.on_value_change(update_window)
+
+        preloaded: set[str] = set()
+
+        def preload() -> None:
+            upcoming = deck.slides[deck.slide_index + 1:deck.slide_index + 1 + prefetch]
+            urls = [url for s in upcoming for url in s.assets if url not in preloaded]
+            if urls:
+                preloaded.update(urls)
+                ui.run_javascript(f'''
+                    {json.dumps(urls)}.forEach((url) => {{
+                        const link = document.createElement("link");
+                        link.rel = "preload";
+                        link.as = "image";
+                        link.href = url;
+                        document.head.appendChild(link);
+                    }});
+                ''')
+
+        def update_steps() -> None:
+            carousel_slides[deck.slide_index].props['data-step'] = deck.slide_step
+
+        update_window()
+        ui.context.client.on_connect(preload)
+
+        def update_slide(i: int) -> None:
+            step_style.update()
+            if i in rendered:
+                carousel_slides[i].clear()
+                render(deck.slides[i], carousel_slides[i])
+                update_steps()
+
+        deck.navigate.subscribe(update_steps)
+        deck.navigate.subscribe(preload)
+        deck.step_change.subscribe(update_steps)
+        deck.slide_update.subscribe(update_slide)
+
+    @ui.page('/follow')
+    def follow():
+        if setup:
+            setup()
+
+        step_style = StepStyle()
+        container = ui.element().classes(f'fixed inset-0 overflow-hidden {classes}')
+        shown_index = -1
+
+        def show_slide() -> None:
+            nonlocal shown_index
+            if deck.slide_index != shown_index:
+                shown_index = deck.slide_index
+                container.clear()
+                render(deck.current_slide, container)
+            update_steps()
+
+        def update_steps() -> None:
+            container.props['data-step'] = deck.slide_step
+
+        show_slide()
+
+        def update_slide(i: int) -> None:
+            nonlocal shown_index
+            step_style.update()
+            if i == shown_index:
+                shown_index = -1
+                show_slide()
+
+        deck.navigate.subscribe(show_slide)
+        deck.step_change.subscribe(update_steps)
+        deck.slide_update.subscribe(update_slide)
+
+    @ui.page('/slide/{key}')
+    @ui.page('/slide/{key}/{step}')
+    def single_slide(key: str, step: int = 0):
+        s = deck.find(key)
+        if s is None:
+            raise HTTPException(404, f'Slide {key} not found')
+        if setup:
+            setup()
+        StepStyle()
+        container = ui.element().classes(f'fixed inset-0 overflow-hidden {classes}')
+        container.props['data-step'] = min(step, s.steps - 1)
+        render(s, container)
+
+    notes_views: set[ui.html] = set()
+
+    def show_notes() -> None:
+        for view in notes_views:
+            view.set_content(deck.current_slide.notes_html)
+
+    deck.navigate.subscribe(show_notes)
+    deck.slide_update.subscribe(show_notes)
 
     @ui.page('/notes')
     def notes():
         ui.add_css('hr { border: 1px dashed gray }')
 
         with ui.row(align_items='center'):
-            ui.label().classes('text-bold text-lg').bind_text_from(timer, 'display')
-            for state, icon, action in [
-                ('initial', 'play_arrow', timer.start),
-                ('running', 'pause', timer.pause),
-                ('paused', 'play_arrow', timer.resume),
-                ('paused', 'replay', timer.reset),
-            ]:
-                ui.button(icon=icon, on_click=action).props('flat round') \
-                    .bind_visibility_from(timer, 'state', value=state)
-
-        @ui.refreshable
-        def show_notes() -> None:
-            ui.markdown(deck.current_slide.notes).classes(NOTE_CLASSES)
-
-        show_notes()
-        deck.navigate.subscribe(show_notes.refresh)
+            Countdown(timer).classes('text-bold text-lg')
+            buttons = {
+                ui.button(icon=icon, on_click=action).props('flat round'): state
+                for state, icon, action in [
+                    ('initial', 'play_arrow', timer.start),
+                    ('running', 'pause', timer.pause),
+                    ('paused', 'play_arrow', timer.resume),
+                    ('paused', 'replay', timer.reset),
+                ]
+            }
+
+        def update_buttons() -> None:
+            for button, state in buttons.items():
+                button.set_visibility(timer.state == state)
+
+        update_buttons()
+        timer.changed.subscribe(update_buttons)
+
+        view = ui.html(deck.current_slide.notes_html, sanitize=False).classes(NOTE_CLASSES)
+
+        def connect() -> None:
+            view.set_content(deck.current_slide.notes_html)
+            notes_views.add(view)
+
+        ui.context.client.on_connect(connect)
+        ui.context.client.on_disconnect(lambda: notes_views.discard(view))
 
     @ui.page('/overview')
-    def overview():
+    def overview(export: bool = False, print: bool = False):  # pylint: disable=redefined-builtin
         if setup:
             setup()
-        ui.add_css('''
-            .overview-slide [style*="opacity"] { opacity: 1 !important; }
-            @media print {
-                .overview-slide { break-before: page; }
-                .overview-slide:first-child { break-before: avoid; }
-            }
-        ''')
+        if export:
+            StepStyle()
+            add_export_navigation()
+        else:
+            ui.add_css('''
+                @media print {
+                    .overview-slide { break-before: page; }
+                    .overview-slide:first-child { break-before: avoid; }
+                }
+            ''')
+        lazy = not export and not print
+        if lazy:
+            ui.link('Print version', '?print=true').classes('fixed top-4 right-4 z-10')
+
+        def create_card() -> ui.card:
+            return ui.card().props('bordered flat') \
+                .classes('w-full aspect-video bg-[#fafbfc] dark:bg-[#0f1117] relative overflow-hidden')
+
+        cards: list[ui.card] = []
+        labels: list[ui.label | None] = []
+
+        def show(i: int, visible: bool) -> None:
+            if visible and not cards[i].default_slot.children:
+                render(deck.slides[i], cards[i])
+                if labels[i]:
+                    labels[i].text = annotation(deck.slides[i])
+            elif not visible:
+                cards[i].clear()
+
+        def update_slide(i: int) -> None:
+            if cards[i].default_slot.children:
+                cards[i].clear()
+                show(i, True)
+
         with ui.column().classes('w-full items-center gap-16 py-8'):
-            for s in deck.slides:
-                Slide.rendering = s
-                s.steps = 1
-                with ui.column().classes('w-full max-w-5xl overview-slide'):
-                    ui.markdown(s.notes).classes(NOTE_CLASSES)
-                    with ui.card().props('bordered flat') \
-                            .classes('w-full aspect-video bg-[#fafbfc] dark:bg-[#0f1117] relative overflow-hidden'):
-                        s.func()
-            Slide.rendering = None
+            for i, s in enumerate(deck.slides):
+                with ui.column().classes('w-full max-w-5xl overview-slide').props(f'data-steps={s.steps}'):
+                    if not export:
+                        ui.html(s.notes_html, sanitize=False).classes(NOTE_CLASSES)
+                    if lazy:
+                        with ui.element('q-intersection').props('margin="1000px 0px"').classes('w-full aspect-video') \
+                                as intersection:
+                            cards.append(create_card())
+                        intersection.on('visibility', lambda e, i=i: show(i, e.args))
+                    else:
+                        cards.append(create_card())
+                    profiling = Slide.profiling and not export
+                    labels.append(ui.label().classes('text-xs text-gray-500') if profiling else None)
+                    if not lazy:
+                        show(i, True)
+        deck.slide_update.subscribe(update_slide)
 
     ui.run(**kwargs)
@@ -3,9 +3,13 @@ from collections.abc import Callable
 from .deck import deck, Slide
 
 
-def slide(notes: str = '') -> Callable:
-    """Register a slide function. Can be used as @nd.slide or @nd.slide(notes='...')."""
+def slide(notes: str = '', *, steps: int | None = None, name: str | None = None) -> Callable:
+    """Register a slide function. Can be used as @nd.slide or @nd.slide(notes='...').
+
+    The number of steps is discovered automatically at startup unless it is declared with `steps`.
+    A `name` makes the slide available at /slide/<name> in addition to /slide/<index>.
+    """
     def decorator(f: Callable) -> Callable:
-        deck.slides.append(Slide(f, notes))
+        deck.add(Slide(f, notes, steps, name))
         return f
     return decorator
@@ -0,0 +1,85 @@
+import asyncio
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+from nicegui import background_tasks
+from nicegui.logging import log
+
+
+class StateBackend:
+    """Base class for sharing the deck position between server processes."""
+
+    async def start(self, on_change: Callable[[int, int], None]) -> None:
+        """Start listening for positions published by other processes."""
+
+    def publish(self, slide_index: int, slide_step: int) -> None:
+        """Send the position to all other processes."""
+
+    async def stop(self) -> None:
+        """Stop sharing the position."""
+
+
+class MemoryBackend(StateBackend):
+    """Keep the deck position in the memory of a single process."""
+
+
+class SocketBackend(StateBackend):
+    """Share the deck position between processes on one machine via a UNIX domain socket.
+
+    The first process creates the socket and relays every position to all other processes.
+    It sends the latest position to processes joining later and has to keep running as long as the others do.
+    """
+
+    def __init__(self, path: str | Path = Path('.nicedeck') / 'state.sock') -> None:
+        self.path = Path(path)
+        self.server: asyncio.Server | None = None
+        self.writers: set[asyncio.StreamWriter] = set()
+        self.latest: bytes | None = None
+        self.on_change: Callable[[int, int], None] = lambda *_: None
+
+    async def start(self, on_change: Callable[[int, int], None]) -> None:
+        self.on_change = on_change
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            self.path.unlink(missing_ok=True)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.server = await asyncio.start_unix_server(self._read, self.path)
+        else:
+            self.writers.add(writer)
+            background_tasks.create(self._read(reader, writer), name='read deck state')
+
+    def publish(self, slide_index: int, slide_step: int) -> None:
+        self._send(json.dumps([slide_index, slide_step]).encode() + b'\n')
+
+    async def stop(self) -> None:
+        for writer in list(self.writers):
+            writer.close()
+            await writer.wait_closed()
+        if self.server is not None:
+            self.server.close()
+            self.path.unlink(missing_ok=True)
+
+    async def _read(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.writers.add(writer)
+        if self.server is not None and self.latest is not None:
+            writer.write(self.latest)
+        try:
+            async for line in reader:
+                self._send(line, exclude=writer)
+                try:
+                    self.on_change(*json.loads(line))
+                except Exception:
+                    log.exception(f'Could not apply the deck state {line!r}')
+        except ConnectionError:
+            log.exception('Could not read the deck state')
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    def _send(self, line: bytes, *, exclude: asyncio.StreamWriter | None = None) -> None:
+        self.latest = line
+        for writer in self.writers:
+            if writer is not exclude:
+                writer.write(line)
@@ -1,13 +1,16 @@
-from typing import Optional, cast
+from typing import Optional
 
-from nicegui import binding, ui
+from nicegui import ui
 
 from .deck import Slide, deck
 
 
 class Step(ui.column):
-    """A context manager for limiting the nested UI elements to certain slide steps."""
-    visible = binding.BindableProperty(on_change=lambda sender, _: cast(Step, sender).handle_visibility_change())
+    """A context manager for limiting the nested UI elements to certain slide steps.
+
+    The visibility is not updated per element.
+    Instead, the slide container carries the current step in its `data-step` attribute and CSS reveals the steps.
+    """
 
     def __init__(self,
                  min: Optional[int] = None,  # pylint: disable=redefined-builtin
@@ -17,13 +20,34 @@ class Step(ui.column):
         assert Slide.rendering is not None, 'Step() must be used inside a slide'
         slide = Slide.rendering
         if min != 0:
-            slide.steps += 1
+            slide.step_counter += 1
         if min is None:
-            min = slide.steps - 1
+            min = slide.step_counter - 1
         if max is None:
             max = 999
-        self.bind_visibility_from(deck, 'slide_step', lambda s: min <= s <= max)
+        self.min = min
+        self.max = max
+        self.props.update({'data-step-min': min, 'data-step-max': max})
+        slide.step_elements.append(self)
+
+    def limit(self, steps: int) -> None:
+        """List the steps in which this element is visible, given the number of steps of its slide."""
+        self.props['data-visible-steps'] = ' '.join(str(i) for i in range(self.min, min(self.max, steps - 1) + 1))
+
+
+class StepStyle:
+    """CSS rules on the current page revealing step elements according to the `data-step` attribute of their slide."""
+
+    def __init__(self) -> None:
+        self.steps = 0
+        self.update()
 
-    def handle_visibility_change(self) -> None:
-        """Called when the visibility of this step changes."""
-        self.style(f'opacity: {1 if self.visible else 0}')
+    def update(self) -> None:
+        """Add rules for steps which are not covered yet, e.g. after a slide has been reloaded with more steps."""
+        steps = max((s.steps for s in deck.slides), default=1)
+        if steps <= self.steps:
+            return
+        rules = [] if self.steps else ['[data-step] [data-step-min] { opacity: 0 }']
+        rules += [f'[data-step="{i}"] [data-visible-steps~="{i}"] {{ opacity: 1 }}' for i in range(self.steps, steps)]
+        ui.add_css('\n'.join(rules))
+        self.steps = steps
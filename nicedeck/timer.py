@@ -2,6 +2,8 @@ import time
 from dataclasses import dataclass, field
 from typing import Literal
 
+from nicegui import Event, ui
+
 
 @dataclass
 class Timer:
@@ -9,36 +11,59 @@ class Timer:
     reference_time: float | None = field(default=None, init=False)
     remaining: float | None = field(default=None, init=False)
     state: Literal['initial', 'running', 'paused'] = field(default='initial', init=False)
+    changed: Event = field(default_factory=Event[[]], init=False)
 
     @property
-    def display(self) -> str:
+    def remaining_time(self) -> float:
         if self.reference_time is not None:
-            return _format_time(self.reference_time - time.time())
+            return self.reference_time - time.time()
         if self.remaining is not None:
-            return _format_time(self.remaining)
-        return _format_time(self.limit)
+            return self.remaining
+        return self.limit
+
+    @property
+    def display(self) -> str:
+        return _format_time(self.remaining_time)
 
     def start(self) -> None:
         self.reference_time = time.time() + self.limit
         self.remaining = None
         self.state = 'running'
+        self.changed.emit()
 
     def pause(self) -> None:
         if self.reference_time is not None:
             self.remaining = self.reference_time - time.time()
         self.reference_time = None
         self.state = 'paused'
+        self.changed.emit()
 
     def resume(self) -> None:
         if self.remaining is not None:
             self.reference_time = time.time() + self.remaining
         self.remaining = None
         self.state = 'running'
+        self.changed.emit()
 
     def reset(self) -> None:
         self.reference_time = None
         self.remaining = None
         self.state = 'initial'
+        self.changed.emit()
+
+
+class Countdown(ui.element, component='countdown.js'):
+    """A label showing the remaining time of a timer, counting down in the browser."""
+
+    def __init__(self, timer: Timer) -> None:
+        super().__init__()
+        self.timer = timer
+        self.update_state()
+        timer.changed.subscribe(self.update_state)
+
+    def update_state(self) -> None:
+        """Send the current timer state to the browser."""
+        self.props.update(remaining=self.timer.remaining_time, running=self.timer.state == 'running')
 
 
 def _format_time(seconds: float) -> str:
@@ -19,22 +19,27 @@ TEXT_60 = 'text-black/60 dark:text-white/60'
 _FACE_SVG = (Path(__file__).parent / 'assets' / 'happy_face.svg').read_text()
 
 
-def setup():
-    class SolarizedLight(SolarizedLightStyle):
-        styles = make_style({**LIGHT_COLORS, 'base0': '#1a1d26', 'base01': '#4a4f5a'})
+class SolarizedLight(SolarizedLightStyle):
+    styles = make_style({**LIGHT_COLORS, 'base0': '#1a1d26', 'base01': '#4a4f5a'})
+
+
+class SolarizedDark(SolarizedDarkStyle):
+    styles = make_style({**DARK_COLORS, 'base0': '#edeff3', 'base01': '#9ba2ae'})
+
 
-    class SolarizedDark(SolarizedDarkStyle):
-        styles = make_style({**DARK_COLORS, 'base0': '#edeff3', 'base01': '#9ba2ae'})
+_CODE_CSS = f'''
+    {HtmlFormatter(nobackground=True, style=SolarizedLight).get_style_defs('div.codehilite')}
+    {HtmlFormatter(nobackground=True, style=SolarizedDark).get_style_defs('.body--dark div.codehilite')}
+'''
 
+
+def setup():
     ui.add_css('.q-carousel__navigation-icon--active .q-icon {color:  #78909c !important; }')
     ui.add_css('''
         @keyframes nicegui-blink { 0%, 90%, 100% { transform: scaleY(1) } 95% { transform: scaleY(0.1) } }
         .svg_eye { animation: nicegui-blink 5s ease-in-out infinite; transform-box: fill-box; transform-origin: center }
     ''')
-    ui.add_css(f'''
-        {HtmlFormatter(nobackground=True, style=SolarizedLight).get_style_defs('div.codehilite')}
-        {HtmlFormatter(nobackground=True, style=SolarizedDark).get_style_defs('.body--dark div.codehilite')}
-    ''')
+    ui.add_css(_CODE_CSS)
 
 
 @contextmanager
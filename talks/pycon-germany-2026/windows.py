@@ -1,4 +1,5 @@
 from collections.abc import Callable
+from functools import lru_cache
 import inspect
 import isort
 from pathlib import Path
@@ -56,7 +57,12 @@ def browser_window(content: Callable) -> ui.column:
 
 def _get_full_code(f: Callable) -> str:
     """Get the full code of a function as a string."""
-    code = inspect.getsource(f).split('# END OF DEMO', 1)[0].strip().splitlines()
+    return _format_full_code(inspect.getsource(f))
+
+
+@lru_cache(maxsize=None)
+def _format_full_code(source: str) -> str:
+    code = source.split('# END OF DEMO', 1)[0].strip().splitlines()
     code = [line for line in code if not line.endswith('# HIDE')]
     while not code[0].strip().startswith(('def', 'async def')):
         del code[0]